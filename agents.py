@@ -5,7 +5,7 @@ import random
 
 from mesa import Agent
 
-from utils import bfs_conflicts, build_rules_kb, make_condition_tokens, severity_to_score, logger
+from utils import build_rules_kb, get_conflicts_cached, make_condition_tokens, rule_key, logger
 
 
 class PatientAgent(Agent):
@@ -42,23 +42,19 @@ class DoctorAgent(Agent):
         def has_conflict(drug: str, current_rx: List[str]) -> Tuple[bool, int]:
             """Check if drug creates conflicts and return risk score"""
             risk = 0
-            dl = drug.lower()
             kb = self.model.rule_engine.kb
             
             # Check drug-drug conflicts
             for existing in current_rx:
-                a, b = sorted([existing.lower(), dl])
-                key = ("drug-drug", a, b)
-                rule = kb.get(key)
+                rule = kb.get(rule_key("drug-drug", existing, drug))
                 if rule:
-                    risk += severity_to_score(rule.severity)
+                    risk += rule.score
             
             # Check drug-condition conflicts
             for ct in condition_tokens:
-                key = ("drug-condition", ct.lower(), dl)
-                rule = kb.get(key)
+                rule = kb.get(rule_key("drug-condition", ct, drug))
                 if rule:
-                    risk += severity_to_score(rule.severity)
+                    risk += rule.score
             
             return risk > 0, risk
         
@@ -147,19 +143,15 @@ class DoctorAgent(Agent):
 
         def predicted_risk(drug: str, current_rx: List[str]) -> int:
             risk = 0
-            dl = drug.lower()
             kb = self.model.rule_engine.kb
             for existing in current_rx:
-                a, b = sorted([existing.lower(), dl])
-                key = ("drug-drug", a, b)
-                rule = kb.get(key)
+                rule = kb.get(rule_key("drug-drug", existing, drug))
                 if rule:
-                    risk += severity_to_score(rule.severity)
+                    risk += rule.score
             for ct in condition_tokens:
-                key = ("drug-condition", ct.lower(), dl)
-                rule = kb.get(key)
+                rule = kb.get(rule_key("drug-condition", ct, drug))
                 if rule:
-                    risk += severity_to_score(rule.severity)
+                    risk += rule.score
             return risk
 
         # Choose drugs that CREATE conflicts (for demonstration purposes)
@@ -194,18 +186,10 @@ class RuleEngineAgent(Agent):
 
     def check_conflicts(self, prescription: List[str], conditions: List[str], allergies: List[str]) -> List[Dict[str, Any]]:
         condition_tokens = make_condition_tokens(conditions, allergies)
-        conflicts = bfs_conflicts(prescription, condition_tokens, self.kb)
-        return [
-            {
-                "type": c.rtype,
-                "item_a": c.item_a,
-                "item_b": c.item_b,
-                "severity": c.severity,
-                "score": c.score,
-                "recommendation": c.recommendation,
-            }
-            for c in conflicts
-        ]
+        # Memoized on (drugs, conditions, KB content): repeat checks from the
+        # UI are lookups, and a rule change invalidates them automatically.
+        conflicts = get_conflicts_cached(prescription, condition_tokens, self.kb)
+        return [c.as_row() for c in conflicts]
 
     def step(self):
         pass
@@ -1562,17 +1562,7 @@ elif page == "Manual Testing":
             )
             
             # Convert Conflict objects to dicts for display
-            conflicts = [
-                {
-                    'type': c.rtype,
-                    'item_a': c.item_a,
-                    'item_b': c.item_b,
-                    'severity': c.severity,
-                    'recommendation': c.recommendation,
-                    'score': c.score
-                }
-                for c in conflicts_list
-            ]
+            conflicts = [c.as_row() for c in conflicts_list]
         
         # Display real-time results
         st.subheader("🔍 Real-Time Conflict Analysis")
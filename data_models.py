@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import re
 from typing import List, Optional
-from pydantic import BaseModel, field_validator, ValidationError
+from pydantic import BaseModel, TypeAdapter, field_validator, ValidationError
 
 ALLOWED_SEVERITIES = {"Major", "Moderate", "Minor"}
 ALLOWED_RULE_TYPES = {"drug-drug", "drug-condition"}
+# ';' list separator, swallowing surrounding whitespace so split parts come out stripped
+LIST_SEP_RE = re.compile(r"\s*;\s*")
 
 class PatientModel(BaseModel):
     id: str
@@ -25,8 +28,7 @@ class PatientModel(BaseModel):
         if isinstance(v, list):
             return [str(x).strip() for x in v if str(x).strip() and str(x).strip().lower() != "none"]
         if isinstance(v, str):
-            parts = [p.strip() for p in v.split(";") if p.strip()]
-            return [p for p in parts if p.lower() != "none"]
+            return [p for p in LIST_SEP_RE.split(v.strip()) if p and p.lower() != "none"]
         return [str(v)]
 
 class DrugModel(BaseModel):
@@ -44,7 +46,7 @@ class DrugModel(BaseModel):
             return [str(x).strip() for x in v if str(x).strip()]
         if isinstance(v, str):
             if ";" in v:
-                return [p.strip() for p in v.split(";") if p.strip() and p.strip().lower() != "none"]
+                return [p for p in LIST_SEP_RE.split(v.strip()) if p and p.lower() != "none"]
             if v.strip():
                 return [v.strip()]
         return []
@@ -88,15 +90,35 @@ class RuleModel(BaseModel):
         return v
 
 
+# Schemas are compiled once per process; reuse them for every row
+_PATIENT_V = TypeAdapter(PatientModel)
+_DRUG_V = TypeAdapter(DrugModel)
+_RULE_V = TypeAdapter(RuleModel)
+_VALIDATORS = {PatientModel: _PATIENT_V, DrugModel: _DRUG_V, RuleModel: _RULE_V}
+
+
+def validate_patient(row: dict) -> PatientModel:
+    return _PATIENT_V.validate_python(row)
+
+
+def validate_drug(row: dict) -> DrugModel:
+    return _DRUG_V.validate_python(row)
+
+
+def validate_rule(row: dict) -> RuleModel:
+    return _RULE_V.validate_python(row)
+
+
 def validate_rows(rows, model_cls):
     """Validate list[dict] rows with the given model class.
     Returns (valid_models, errors) where errors is list of (index, error_message).
     """
+    adapter = _VALIDATORS.get(model_cls) or TypeAdapter(model_cls)
     valid = []
     errors = []
     for idx, row in enumerate(rows):
         try:
-            obj = model_cls(**row)
+            obj = adapter.validate_python(row)
             valid.append(obj)
         except ValidationError as e:
             errors.append((idx, e.errors()))
@@ -19,6 +19,7 @@ class HealthcareModel(Model):
         
         # Load data
         self.patients_rows = load_patients(self.data_dir / "patients.csv")
+        self.patients_by_id: Dict[str, Dict[str, Any]] = {r['id']: r for r in self.patients_rows}
         self.drugs_rows = load_drugs(self.data_dir / "drugs.csv")
         self.rules_rows = load_rules(self.data_dir / "rules.csv")
 
@@ -8,9 +8,13 @@ Generates professional PDF and Word reports with:
 - Visual charts and formatted tables
 """
 
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional, BinaryIO
 from io import BytesIO
 
 # PDF generation
@@ -28,6 +32,41 @@ from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 
+# Shared table styling, built once at import instead of per report
+PATIENT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8e8e8')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+])
+WORD_PATIENT_TABLE_STYLE = 'Light Grid Accent 1'
+DOCX_WRITE_BUFFER = 1024 * 1024
+
+
+def _prepare_output(output: Path | str | BinaryIO) -> Path | BinaryIO:
+    """Streams pass through; paths are normalized and their directory created."""
+    if hasattr(output, "write"):
+        return output
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _severity_counts(conflicts: List[Dict[str, Any]]) -> tuple[int, int, int]:
+    """(major, moderate, minor) conflict counts, in a single pass."""
+    counts = Counter(c.get('severity') for c in conflicts)
+    return counts['Major'], counts['Moderate'], counts['Minor']
+
+
+def _join_or_none(items: List[str]) -> str:
+    """Format a list for display, falling back to 'None' when empty."""
+    return ', '.join(items) if items else 'None'
+
+
 class ReportGenerator:
     """Generate PDF and Word reports for drug conflict analysis."""
     
@@ -68,36 +107,36 @@ class ReportGenerator:
     
     def generate_pdf_report(
         self,
-        output_path: Path | str,
+        output_path: Path | str | BinaryIO,
         patient_name: str,
         patient_id: str,
         conditions: List[str],
         allergies: List[str],
         prescription: List[str],
-        conflicts: List[Dict[str, Any]],
+        conflicts: Iterable[Dict[str, Any]],
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Path:
+    ) -> Path | BinaryIO:
         """Generate a PDF report of conflict analysis.
         
         Args:
-            output_path: Path to save the PDF report
+            output_path: Path to save the PDF report, or a binary stream to write it to
             patient_name: Patient's name
             patient_id: Patient identifier
             conditions: List of medical conditions
             allergies: List of allergies
             prescription: List of prescribed drugs
-            conflicts: List of detected conflicts
+            conflicts: Detected conflicts (any iterable, consumed once)
             metadata: Optional additional metadata
             
         Returns:
-            Path to generated PDF file
+            Path to generated PDF file (or the stream that was passed in)
         """
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = _prepare_output(output_path)
+        conflicts = list(conflicts)  # summary counts come before the details
         
         # Create PDF document
         doc = SimpleDocTemplate(
-            str(output_path),
+            str(output_path) if isinstance(output_path, Path) else output_path,
             pagesize=letter,
             rightMargin=72,
             leftMargin=72,
@@ -122,21 +161,12 @@ class ReportGenerator:
         patient_data = [
             ['Patient Name:', patient_name],
             ['Patient ID:', patient_id],
-            ['Conditions:', ', '.join(conditions) if conditions else 'None'],
-            ['Allergies:', ', '.join(allergies) if allergies else 'None']
+            ['Conditions:', _join_or_none(conditions)],
+            ['Allergies:', _join_or_none(allergies)]
         ]
         
         patient_table = Table(patient_data, colWidths=[2*inch, 4*inch])
-        patient_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8e8e8')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
+        patient_table.setStyle(PATIENT_TABLE_STYLE)
         story.append(patient_table)
         story.append(Spacer(1, 20))
         
@@ -154,9 +184,7 @@ class ReportGenerator:
         
         if conflicts:
             # Summary
-            major = sum(1 for c in conflicts if c.get('severity') == 'Major')
-            moderate = sum(1 for c in conflicts if c.get('severity') == 'Moderate')
-            minor = sum(1 for c in conflicts if c.get('severity') == 'Minor')
+            major, moderate, minor = _severity_counts(conflicts)
             
             summary_text = f"<b>Total Conflicts:</b> {len(conflicts)} "
             summary_text += f"(<font color='red'>Major: {major}</font>, "
@@ -237,32 +265,32 @@ class ReportGenerator:
     
     def generate_word_report(
         self,
-        output_path: Path | str,
+        output_path: Path | str | BinaryIO,
         patient_name: str,
         patient_id: str,
         conditions: List[str],
         allergies: List[str],
         prescription: List[str],
-        conflicts: List[Dict[str, Any]],
+        conflicts: Iterable[Dict[str, Any]],
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Path:
+    ) -> Path | BinaryIO:
         """Generate a Word document report of conflict analysis.
         
         Args:
-            output_path: Path to save the Word document
+            output_path: Path to save the Word document, or a binary stream to write it to
             patient_name: Patient's name
             patient_id: Patient identifier
             conditions: List of medical conditions
             allergies: List of allergies
             prescription: List of prescribed drugs
-            conflicts: List of detected conflicts
+            conflicts: Detected conflicts (any iterable, consumed once)
             metadata: Optional additional metadata
             
         Returns:
-            Path to generated Word document
+            Path to generated Word document (or the stream that was passed in)
         """
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = _prepare_output(output_path)
+        conflicts = list(conflicts)  # summary counts come before the details
         
         # Create Word document
         doc = Document()
@@ -279,21 +307,19 @@ class ReportGenerator:
         
         # Patient Information
         doc.add_heading('Patient Information', 1)
-        patient_table = doc.add_table(rows=4, cols=2)
-        patient_table.style = 'Light Grid Accent 1'
-        
-        patient_table.rows[0].cells[0].text = 'Patient Name:'
-        patient_table.rows[0].cells[1].text = patient_name
-        patient_table.rows[1].cells[0].text = 'Patient ID:'
-        patient_table.rows[1].cells[1].text = patient_id
-        patient_table.rows[2].cells[0].text = 'Conditions:'
-        patient_table.rows[2].cells[1].text = ', '.join(conditions) if conditions else 'None'
-        patient_table.rows[3].cells[0].text = 'Allergies:'
-        patient_table.rows[3].cells[1].text = ', '.join(allergies) if allergies else 'None'
-        
-        # Bold first column
-        for row in patient_table.rows:
-            row.cells[0].paragraphs[0].runs[0].bold = True
+        patient_data = [
+            ('Patient Name:', patient_name),
+            ('Patient ID:', patient_id),
+            ('Conditions:', _join_or_none(conditions)),
+            ('Allergies:', _join_or_none(allergies)),
+        ]
+        patient_table = doc.add_table(rows=len(patient_data), cols=2)
+        patient_table.style = WORD_PATIENT_TABLE_STYLE
+        
+        # Write runs directly; the cell.text setter rebuilds the cell XML
+        for row, (label, value) in zip(patient_table.rows, patient_data):
+            row.cells[0].paragraphs[0].add_run(label).bold = True
+            row.cells[1].paragraphs[0].add_run(value)
         
         doc.add_paragraph()
         
@@ -312,9 +338,7 @@ class ReportGenerator:
         
         if conflicts:
             # Summary
-            major = sum(1 for c in conflicts if c.get('severity') == 'Major')
-            moderate = sum(1 for c in conflicts if c.get('severity') == 'Moderate')
-            minor = sum(1 for c in conflicts if c.get('severity') == 'Minor')
+            major, moderate, minor = _severity_counts(conflicts)
             
             summary = doc.add_paragraph()
             summary.add_run(f"Total Conflicts: {len(conflicts)} ").bold = True
@@ -403,8 +427,12 @@ class ReportGenerator:
         )
         disclaimer.runs[0].italic = True
         
-        # Save document
-        doc.save(str(output_path))
+        # Save document; zipfile issues many small writes, so give it a large buffer
+        if isinstance(output_path, Path):
+            with open(output_path, 'wb', buffering=DOCX_WRITE_BUFFER) as f:
+                doc.save(f)
+        else:
+            doc.save(output_path)
         return output_path
     
     def generate_report_bytes(
@@ -415,7 +443,7 @@ class ReportGenerator:
         conditions: List[str],
         allergies: List[str],
         prescription: List[str],
-        conflicts: List[Dict[str, Any]],
+        conflicts: Iterable[Dict[str, Any]],
         metadata: Optional[Dict[str, Any]] = None
     ) -> BytesIO:
         """Generate report as bytes for streaming/download.
@@ -429,43 +457,43 @@ class ReportGenerator:
         """
         buffer = BytesIO()
         
+        # Both builders write straight into the buffer, no temp file round trip
         if format_type.lower() == 'pdf':
-            # Create temporary path
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
-                tmp_path = Path(tmp.name)
-            
-            # Generate PDF
             self.generate_pdf_report(
-                tmp_path, patient_name, patient_id, conditions,
+                buffer, patient_name, patient_id, conditions,
                 allergies, prescription, conflicts, metadata
             )
-            
-            # Read into buffer
-            with open(tmp_path, 'rb') as f:
-                buffer.write(f.read())
-            
-            # Cleanup
-            tmp_path.unlink()
-            
         elif format_type.lower() in ['word', 'docx']:
-            # Create temporary path
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as tmp:
-                tmp_path = Path(tmp.name)
-            
-            # Generate Word document using the full method
             self.generate_word_report(
-                tmp_path, patient_name, patient_id, conditions,
+                buffer, patient_name, patient_id, conditions,
                 allergies, prescription, conflicts, metadata
             )
-            
-            # Read into buffer
-            with open(tmp_path, 'rb') as f:
-                buffer.write(f.read())
-            
-            # Cleanup
-            tmp_path.unlink()
         
         buffer.seek(0)
         return buffer
+    
+    def generate_many(self, jobs: List[Dict[str, Any]], workers: Optional[int] = None) -> List[bytes]:
+        """Generate several reports in parallel worker processes.
+        
+        Report building is pure Python (reportlab / python-docx), so threads
+        would serialize on the GIL; each job runs in its own process instead.
+        Workers build a fresh instance of this generator's class, so a
+        subclass renders the same way whatever the worker count.
+        
+        Args:
+            jobs: Keyword arguments for generate_report_bytes, one dict per report
+            workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Report contents as bytes, in the same order as jobs
+        """
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            return [self.generate_report_bytes(**job).getvalue() for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(functools.partial(_render_report, type(self)), jobs))
+
+
+def _render_report(cls: type, job: Dict[str, Any]) -> bytes:
+    """Process pool entry point: build one report and return its bytes."""
+    return cls().generate_report_bytes(**job).getvalue()
@@ -1,6 +1,25 @@
 import sys
 from pathlib import Path
 
+import pytest
+
+# Project root doubles as the data directory (patients/drugs/rules CSVs)
+DATA_DIR = Path(__file__).resolve().parent.parent
+
 # Add parent directory to sys.path so tests can import project modules
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(DATA_DIR))
+
+
+@pytest.fixture(scope="session")
+def data_dir():
+    return DATA_DIR
+
+
+@pytest.fixture(scope="session")
+def healthcare_model(data_dir):
+    """One HealthcareModel for the whole session; loading the CSVs dominates setup.
+
+    Tests must not mutate it (conflict logs, patient prescriptions).
+    """
+    from model import HealthcareModel
+    return HealthcareModel(data_dir=data_dir)
@@ -0,0 +1,19 @@
+"""Shared helpers for conflict-detection tests."""
+
+from utils import rule_key
+
+
+def index_conflicts(conflicts):
+    """Index conflicts by canonical KB key so assertions are O(1) lookups.
+
+    Accepts Conflict objects (bfs_conflicts) or dicts (check_conflicts).
+    Drug-drug keys are order-insensitive, matching how the KB stores them.
+    """
+    index = {}
+    for c in conflicts:
+        if isinstance(c, dict):
+            key = rule_key(c['type'], c['item_a'], c['item_b'])
+        else:
+            key = rule_key(c.rtype, c.item_a, c.item_b)
+        index[key] = c
+    return index
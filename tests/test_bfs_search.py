@@ -1,20 +1,23 @@
 """
-Tests for the Best-First Search conflict detection algorithm.
+Tests for the severity-prioritized conflict detection algorithm.
 
 Verifies that the search:
 1. Discovers all conflicts systematically
 2. Prioritizes high-severity conflicts
-3. Handles state space exploration correctly
-4. Maintains visited state tracking
+3. Reports each matching rule exactly once
+4. Matches drugs/conditions case-insensitively
+5. Sees rules added to or removed from a built knowledge base
 """
 
 import pytest
-from utils import bfs_conflicts, Rule
+from utils import bfs_conflicts, build_rules_kb, Rule
+from tests.helpers import index_conflicts
 
 
-def test_bfs_discovers_all_conflicts():
-    """BFS should discover all possible conflicts in a multi-drug prescription."""
-    kb = {
+@pytest.fixture(scope="module")
+def clinical_kb():
+    """Realistic drug-drug, drug-condition and allergy rules."""
+    return {
         ("drug-drug", "aspirin", "warfarin"): Rule(
             rtype="drug-drug",
             item_a="Aspirin",
@@ -36,27 +39,20 @@ def test_bfs_discovers_all_conflicts():
             severity="Major",
             recommendation="Can elevate blood pressure"
         ),
+        ("drug-condition", "penicillinallergy", "amoxicillin"): Rule(
+            rtype="drug-condition",
+            item_a="PenicillinAllergy",
+            item_b="Amoxicillin",
+            severity="Major",
+            recommendation="Contraindicated - cross-reactivity"
+        ),
     }
-    
-    prescription = ["Aspirin", "Warfarin", "Ibuprofen"]
-    conditions = ["Hypertension"]
-    
-    conflicts = bfs_conflicts(prescription, conditions, kb)
-    
-    # Should find all 3 conflicts
-    assert len(conflicts) == 3
-    
-    # Extract conflict identifiers
-    conflict_keys = {(c.rtype, c.item_a.lower(), c.item_b.lower()) for c in conflicts}
-    
-    assert ("drug-drug", "aspirin", "warfarin") in conflict_keys
-    assert ("drug-drug", "aspirin", "ibuprofen") in conflict_keys
-    assert ("drug-condition", "hypertension", "ibuprofen") in conflict_keys
-
-
-def test_bfs_prioritizes_major_severity():
-    """BFS should report Major conflicts before Minor ones."""
-    kb = {
+
+
+@pytest.fixture(scope="module")
+def severity_kb():
+    """Three disjoint drug pairs, one per severity level."""
+    return {
         ("drug-drug", "a", "b"): Rule(
             rtype="drug-drug",
             item_a="A",
@@ -79,133 +75,112 @@ def test_bfs_prioritizes_major_severity():
             recommendation="Use caution"
         ),
     }
-    
+
+
+@pytest.mark.parametrize("prescription,conditions,expected", [
+    # All conflicts in a multi-drug prescription
+    (
+        ["Aspirin", "Warfarin", "Ibuprofen"],
+        ["Hypertension"],
+        {
+            ("drug-drug", "aspirin", "warfarin"): "Major",
+            ("drug-drug", "aspirin", "ibuprofen"): "Moderate",
+            ("drug-condition", "hypertension", "ibuprofen"): "Major",
+        },
+    ),
+    # Allergies arrive as condition tokens (make_condition_tokens appends "Allergy")
+    (
+        ["Amoxicillin"],
+        ["PenicillinAllergy"],
+        {("drug-condition", "penicillinallergy", "amoxicillin"): "Major"},
+    ),
+    # Mixed case in the prescription
+    (
+        ["ASPIRIN", "warfarin"],
+        [],
+        {("drug-drug", "aspirin", "warfarin"): "Major"},
+    ),
+])
+def test_bfs_discovers_expected_conflicts(clinical_kb, prescription, conditions, expected):
+    """BFS should discover exactly the conflicts whose rules match the query."""
+    conflicts = bfs_conflicts(prescription, conditions, clinical_kb)
+
+    assert len(conflicts) == len(expected)
+    idx = index_conflicts(conflicts)
+    for key, severity in expected.items():
+        assert key in idx
+        assert idx[key].severity == severity
+
+
+@pytest.mark.parametrize("prescription,conditions", [
+    (["A", "B", "C"], []),  # No conflict rules for these
+    ([], []),               # Empty prescription
+    ([], ["Hypertension"]), # Conditions alone never conflict
+])
+def test_bfs_returns_empty_without_matches(clinical_kb, prescription, conditions):
+    """BFS should return an empty list when no rule matches."""
+    assert bfs_conflicts(prescription, conditions, clinical_kb) == []
+
+
+def test_bfs_prioritizes_major_severity(severity_kb):
+    """BFS should report Major conflicts before Minor ones."""
+    conflicts = bfs_conflicts(["A", "B", "C", "D", "E", "F"], [], severity_kb)
+
+    # All 3, Major first and Minor last
+    assert [c.severity for c in conflicts] == ["Major", "Moderate", "Minor"]
+    assert (conflicts[0].item_a.lower(), conflicts[0].item_b.lower()) == ("c", "d")
+
+
+def test_bfs_top_k_returns_most_severe(severity_kb):
+    """top_k should keep the k worst conflicts in the full-sort order."""
     prescription = ["A", "B", "C", "D", "E", "F"]
-    conditions = []
-    
-    conflicts = bfs_conflicts(prescription, conditions, kb)
-    
-    # Should find all 3
-    assert len(conflicts) == 3
-    
-    # Major should appear first
-    assert conflicts[0].severity == "Major"
-    assert conflicts[0].item_a.lower() == "c"
-    assert conflicts[0].item_b.lower() == "d"
-    
-    # Moderate second
-    assert conflicts[1].severity == "Moderate"
-    
-    # Minor last
-    assert conflicts[2].severity == "Minor"
-
-
-def test_bfs_handles_no_conflicts():
-    """BFS should return empty list when no conflicts exist."""
-    kb = {
-        ("drug-drug", "x", "y"): Rule(
-            rtype="drug-drug",
-            item_a="X",
-            item_b="Y",
-            severity="Major",
-            recommendation="Don't combine"
-        ),
-    }
-    
-    prescription = ["A", "B", "C"]  # No conflict rules for these
-    conditions = []
-    
-    conflicts = bfs_conflicts(prescription, conditions, kb)
-    assert len(conflicts) == 0
+    full = bfs_conflicts(prescription, [], severity_kb)
+    top = bfs_conflicts(prescription, [], severity_kb, top_k=2)
 
+    assert [c.severity for c in top] == ["Major", "Moderate"]
+    assert top == full[:2]
 
-def test_bfs_handles_empty_prescription():
-    """BFS should return empty list for empty prescription."""
-    kb = {
-        ("drug-drug", "a", "b"): Rule(
-            rtype="drug-drug",
-            item_a="A",
-            item_b="B",
-            severity="Major",
-            recommendation="Avoid"
-        ),
-    }
-    
-    conflicts = bfs_conflicts([], [], kb)
-    assert len(conflicts) == 0
 
+def test_bfs_reports_each_pair_once(severity_kb):
+    """BFS should report each matching pair exactly once, worst first."""
+    conflicts = bfs_conflicts(["A", "B", "C", "D", "A"], [], severity_kb)
 
-def test_bfs_state_space_exploration():
-    """BFS should explore state space without revisiting conflict sets."""
-    # Setup: 4 drugs with 2 pairs creating conflicts
-    kb = {
-        ("drug-drug", "a", "b"): Rule(
-            rtype="drug-drug",
-            item_a="A",
-            item_b="B",
-            severity="Major",
-            recommendation="R1"
-        ),
-        ("drug-drug", "c", "d"): Rule(
-            rtype="drug-drug",
-            item_a="C",
-            item_b="D",
-            severity="Moderate",
-            recommendation="R2"
-        ),
-    }
-    
-    prescription = ["A", "B", "C", "D"]
-    conditions = []
-    
-    conflicts = bfs_conflicts(prescription, conditions, kb)
-    
-    # Should find exactly 2 conflicts (both pairs)
+    # Should find exactly 2 conflicts (both pairs), despite the repeated drug
     assert len(conflicts) == 2
-    assert conflicts[0].severity == "Major"  # A-B explored first
-    assert conflicts[1].severity == "Moderate"  # C-D explored second
+    assert conflicts[0].severity == "Major"  # C-D first
+    assert conflicts[1].severity == "Minor"  # A-B second
 
 
-def test_bfs_with_allergies_as_conditions():
-    """BFS should detect drug-condition conflicts for allergies."""
-    kb = {
-        ("drug-condition", "penicillinallergy", "amoxicillin"): Rule(
-            rtype="drug-condition",
-            item_a="PenicillinAllergy",
-            item_b="Amoxicillin",
-            severity="Major",
-            recommendation="Contraindicated - cross-reactivity"
-        ),
-    }
-    
-    prescription = ["Amoxicillin"]
-    # Note: make_condition_tokens in utils.py handles appending "Allergy"
-    conditions = ["PenicillinAllergy"]  # Already formatted
-    
-    conflicts = bfs_conflicts(prescription, conditions, kb)
-    
-    assert len(conflicts) == 1
-    assert conflicts[0].severity == "Major"
-    assert "amoxicillin" in conflicts[0].item_b.lower()
-
-
-def test_bfs_case_insensitive_matching():
-    """BFS should match drugs/conditions case-insensitively."""
-    kb = {
-        ("drug-drug", "aspirin", "warfarin"): Rule(
-            rtype="drug-drug",
-            item_a="Aspirin",
-            item_b="Warfarin",
-            severity="Major",
-            recommendation="Bleeding risk"
-        ),
-    }
-    
-    # Mix cases in prescription
-    prescription = ["ASPIRIN", "warfarin"]
-    conditions = []
-    
-    conflicts = bfs_conflicts(prescription, conditions, kb)
-    
-    assert len(conflicts) == 1
-    assert conflicts[0].severity == "Major"
+def test_bfs_stop_at_severity_returns_first_major(severity_kb):
+    """stop_at_severity should stop right after the first Major conflict."""
+    conflicts = bfs_conflicts(["A", "B", "C", "D", "E", "F"], [], severity_kb, stop_at_severity="Major")
+    assert [c.severity for c in conflicts] == ["Major"]
+
+    # Without a Major conflict the search drains in severity order
+    conflicts = bfs_conflicts(["A", "B", "E", "F"], [], severity_kb, stop_at_severity="Major")
+    assert [c.severity for c in conflicts] == ["Moderate", "Minor"]
+
+
+@pytest.mark.parametrize("label", ["Critical", "Severe"])
+def test_bfs_stop_at_severity_rejects_unknown_label(severity_kb, label):
+    """An unknown severity label must raise instead of silently dropping conflicts."""
+    with pytest.raises(ValueError):
+        bfs_conflicts(["A", "B", "E", "F"], [], severity_kb, stop_at_severity=label)
+
+
+def test_bfs_sees_rules_changed_after_build():
+    """Mutating a built KB must not leave a stale rule index behind."""
+    kb = build_rules_kb([
+        {"type": "drug-drug", "item_a": "A", "item_b": "B", "severity": "Minor", "recommendation": "Monitor"},
+    ])
+    assert bfs_conflicts(["A", "C"], [], kb) == []
+
+    rule = Rule(rtype="drug-drug", item_a="A", item_b="C", severity="Major", recommendation="Avoid")
+    kb[rule.key] = rule
+    assert [c.severity for c in bfs_conflicts(["A", "C"], [], kb)] == ["Major"]
+
+    del kb[rule.key]
+    assert bfs_conflicts(["A", "C"], [], kb) == []
+
+    kb.update({rule.key: rule})
+    assert [c.severity for c in bfs_conflicts(["A", "C"], [], kb)] == ["Major"]
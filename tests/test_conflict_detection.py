@@ -1,13 +1,9 @@
-from utils import load_rules, make_condition_tokens, severity_to_score
+from utils import load_rules, make_condition_tokens, severity_to_score, bfs_conflicts, conflicts_to_frame
 from agents import RuleEngineAgent, PatientAgent
-from model import HealthcareModel
-from pathlib import Path
 
-DATA_DIR = Path(__file__).parent.parent
 
-
-def test_hypertension_ibuprofen_conflict():
-    model = HealthcareModel(data_dir=DATA_DIR)
+def test_hypertension_ibuprofen_conflict(healthcare_model):
+    model = healthcare_model
     rule_engine = model.rule_engine
     prescription = ["Lisinopril", "Ibuprofen"]
     conditions = ["Hypertension"]
@@ -17,9 +13,9 @@ def test_hypertension_ibuprofen_conflict():
     assert any(c['item_a'] == 'Hypertension' and c['item_b'] == 'Ibuprofen' and c['severity'] == 'Moderate' for c in conflicts), conflicts
 
 
-def test_severity_scores_ordering():
+def test_severity_scores_ordering(healthcare_model):
     # Construct artificial rules to ensure ordering
-    model = HealthcareModel(data_dir=DATA_DIR)
+    model = healthcare_model
     rule_engine = model.rule_engine
     prescription = ["Warfarin", "Aspirin"]  # Major interaction
     conditions = []
@@ -29,3 +25,11 @@ def test_severity_scores_ordering():
     assert target is not None
     assert target['severity'] == 'Major'
     assert target['score'] == 3
+
+
+def test_conflicts_to_frame_accepts_generator(healthcare_model):
+    kb = healthcare_model.rule_engine.kb
+    conflicts = bfs_conflicts(["Warfarin", "Aspirin"], [], kb)
+    df = conflicts_to_frame(c for c in conflicts)
+    assert len(df) == len(conflicts) > 0
+    assert df["severity"].tolist() == [c.severity for c in conflicts]
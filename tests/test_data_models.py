@@ -1,18 +1,19 @@
-from data_models import PatientModel, RuleModel, DrugModel, validate_rows, ALLOWED_SEVERITIES
-from pydantic import ValidationError
+from data_models import validate_patient, validate_rule, validate_drug, validate_rows, ALLOWED_SEVERITIES
 
 
 def test_patient_semicolon_parsing():
     row = {"id": "1", "name": "Test", "conditions": "Hypertension;Diabetes;None", "allergies": "Penicillin;None"}
-    p = PatientModel(**row)
+    p = validate_patient(row)
     assert p.conditions == ["Hypertension", "Diabetes"]
     assert p.allergies == ["Penicillin"]
 
 
 def test_rule_invalid_severity():
+    from pydantic import ValidationError
+
     bad = {"type": "drug-drug", "item_a": "Aspirin", "item_b": "Warfarin", "severity": "Severe", "recommendation": "Avoid"}
     try:
-        RuleModel(**bad)
+        validate_rule(bad)
     except ValidationError as e:
         assert any(err['loc'] == ('severity',) for err in e.errors())
     else:
@@ -21,5 +22,5 @@ def test_rule_invalid_severity():
 
 def test_drug_replacements_parsing():
     row = {"drug": "Lisinopril", "condition": "Hypertension", "category": "ACE", "replacements": "Losartan;None"}
-    d = DrugModel(**row)
+    d = validate_drug(row)
     assert d.replacements == ["Losartan"]
@@ -3,10 +3,21 @@
 Verifies that:
 1. get_conflicts_cached returns identical results to bfs_conflicts
 2. Subsequent identical calls register a cache hit
-3. Changing KB invalidates cache (different id)
+3. Rebuilding an identical KB reuses the cache; changing rules invalidates it,
+   including rules changed in place on an already-built KB
+4. The cache is bounded and evicts the least recently used entry
 """
 
-from utils import build_rules_kb, get_conflicts_cached, bfs_conflicts, Rule, _MEMO_STATS
+import pytest
+
+import utils
+from utils import build_rules_kb, get_conflicts_cached, bfs_conflicts, Rule, _MEMO_CACHE, _MEMO_STATS
+
+
+@pytest.fixture(autouse=True)
+def _clear_memo_cache():
+    # Entries are keyed by KB content, so they outlive any one test's KB
+    _MEMO_CACHE.clear()
 
 
 def _make_kb():
@@ -48,13 +59,55 @@ def test_cache_hits_increment():
     assert _MEMO_STATS["hits"] == start_hits + 1
 
 
+def test_rebuilt_identical_kb_hits_cache():
+    kb1 = _make_kb()
+    kb2 = _make_kb()  # new object, same rules
+    prescription = ["Aspirin", "Warfarin"]
+    conditions = []
+
+    get_conflicts_cached(prescription, conditions, kb1)
+    hits_before = _MEMO_STATS["hits"]
+    get_conflicts_cached(prescription, conditions, kb2)  # same content -> hit
+    assert _MEMO_STATS["hits"] == hits_before + 1
+
+
 def test_kb_change_invalidates_cache():
     kb1 = _make_kb()
-    kb2 = _make_kb()  # new object, different id(kb)
+    kb2 = build_rules_kb([
+        {"type": "drug-drug", "item_a": "Aspirin", "item_b": "Warfarin", "severity": "Moderate", "recommendation": "Monitor INR"},
+    ])
     prescription = ["Aspirin", "Warfarin"]
     conditions = []
 
     get_conflicts_cached(prescription, conditions, kb1)
     hits_before = _MEMO_STATS["hits"]
-    get_conflicts_cached(prescription, conditions, kb2)  # should be miss due to kb id change
+    result = get_conflicts_cached(prescription, conditions, kb2)  # rules changed -> miss
     assert _MEMO_STATS["hits"] == hits_before  # no new hit
+    assert result[0].severity == "Moderate"
+
+
+
+def test_kb_mutation_invalidates_cache():
+    kb = _make_kb()
+    prescription = ["Aspirin", "Warfarin"]
+
+    assert get_conflicts_cached(prescription, [], kb)[0].severity == "Major"
+    rule = Rule(rtype="drug-drug", item_a="Aspirin", item_b="Warfarin", severity="Minor", recommendation="Monitor")
+    kb[rule.key] = rule
+
+    hits_before = _MEMO_STATS["hits"]
+    result = get_conflicts_cached(prescription, [], kb)  # content changed -> miss
+    assert _MEMO_STATS["hits"] == hits_before
+    assert result[0].severity == "Minor"
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(utils, "_MEMO_MAXSIZE", 2)
+    kb = _make_kb()
+
+    get_conflicts_cached(["Aspirin"], [], kb)
+    get_conflicts_cached(["Warfarin"], [], kb)
+    get_conflicts_cached(["Aspirin"], [], kb)  # refresh: Warfarin is now oldest
+    get_conflicts_cached(["Ibuprofen"], [], kb)
+
+    cached_drugs = {drugs for drugs, _, _ in _MEMO_CACHE}
+    assert cached_drugs == {frozenset({"aspirin"}), frozenset({"ibuprofen"})}
@@ -4,36 +4,32 @@ Verifies that the conflict detection works correctly for the manual testing inte
 """
 
 import pytest
-from model import HealthcareModel
-from pathlib import Path
 
+from tests.helpers import index_conflicts
 
-def test_realtime_conflict_detection_basic():
+
+def test_realtime_conflict_detection_basic(healthcare_model):
     """Test that real-time conflict detection finds known conflicts."""
-    base_dir = Path(__file__).parent.parent
-    model = HealthcareModel(data_dir=base_dir)
+    rule_engine = healthcare_model.rule_engine
     
     # Test a known conflict: Aspirin + Warfarin
-    conflicts = model.rule_engine.check_conflicts(
+    conflicts = rule_engine.check_conflicts(
         prescription=["Aspirin", "Warfarin"],
         conditions=[],
         allergies=[]
     )
     
     assert len(conflicts) > 0
-    # Should find Aspirin-Warfarin interaction
-    conflict_pairs = [(c['item_a'].lower(), c['item_b'].lower()) for c in conflicts]
-    assert any(('aspirin' in pair and 'warfarin' in pair) or ('warfarin' in pair and 'aspirin' in pair) 
-               for pair in conflict_pairs)
+    # Should find Aspirin-Warfarin interaction (in either order)
+    assert ('drug-drug', 'aspirin', 'warfarin') in index_conflicts(conflicts)
 
 
-def test_realtime_no_conflicts_safe():
+def test_realtime_no_conflicts_safe(healthcare_model):
     """Test that safe prescriptions return no conflicts."""
-    base_dir = Path(__file__).parent.parent
-    model = HealthcareModel(data_dir=base_dir)
+    rule_engine = healthcare_model.rule_engine
     
     # Test a safe combination (no known interactions)
-    conflicts = model.rule_engine.check_conflicts(
+    conflicts = rule_engine.check_conflicts(
         prescription=["Lisinopril"],
         conditions=["Diabetes"],
         allergies=[]
@@ -43,13 +39,12 @@ def test_realtime_no_conflicts_safe():
     assert len(conflicts) == 0
 
 
-def test_realtime_drug_condition_conflict():
+def test_realtime_drug_condition_conflict(healthcare_model):
     """Test that drug-condition conflicts are detected in real-time."""
-    base_dir = Path(__file__).parent.parent
-    model = HealthcareModel(data_dir=base_dir)
+    rule_engine = healthcare_model.rule_engine
     
     # Ibuprofen + Hypertension is a known conflict
-    conflicts = model.rule_engine.check_conflicts(
+    conflicts = rule_engine.check_conflicts(
         prescription=["Ibuprofen"],
         conditions=["Hypertension"],
         allergies=[]
@@ -57,34 +52,31 @@ def test_realtime_drug_condition_conflict():
     
     assert len(conflicts) > 0
     # Check it's a drug-condition type
-    assert any(c['type'] == 'drug-condition' for c in conflicts)
+    assert ('drug-condition', 'hypertension', 'ibuprofen') in index_conflicts(conflicts)
 
 
-def test_realtime_allergy_detection():
+def test_realtime_allergy_detection(healthcare_model):
     """Test that allergies are detected as conflicts."""
-    base_dir = Path(__file__).parent.parent
-    model = HealthcareModel(data_dir=base_dir)
+    rule_engine = healthcare_model.rule_engine
     
     # Aspirin with Aspirin allergy
-    conflicts = model.rule_engine.check_conflicts(
+    conflicts = rule_engine.check_conflicts(
         prescription=["Aspirin"],
         conditions=[],
         allergies=["Aspirin"]
     )
     
     assert len(conflicts) > 0
-    # Should detect AspiriAllergy in conditions
-    assert any('allergy' in c['item_a'].lower() or 'allergy' in c['item_b'].lower() 
-               for c in conflicts)
+    # Should detect AspirinAllergy in conditions
+    assert ('drug-condition', 'aspirinallergy', 'aspirin') in index_conflicts(conflicts)
 
 
-def test_realtime_multiple_conflicts():
+def test_realtime_multiple_conflicts(healthcare_model):
     """Test detection of multiple conflicts simultaneously."""
-    base_dir = Path(__file__).parent.parent
-    model = HealthcareModel(data_dir=base_dir)
+    rule_engine = healthcare_model.rule_engine
     
     # Risky combination: multiple anticoagulants + NSAIDs + hypertension
-    conflicts = model.rule_engine.check_conflicts(
+    conflicts = rule_engine.check_conflicts(
         prescription=["Aspirin", "Warfarin", "Ibuprofen"],
         conditions=["Hypertension"],
         allergies=[]
@@ -98,12 +90,11 @@ def test_realtime_multiple_conflicts():
     assert len(severities) > 0
 
 
-def test_realtime_severity_ordering():
+def test_realtime_severity_ordering(healthcare_model):
     """Test that conflicts are returned with proper severity scores."""
-    base_dir = Path(__file__).parent.parent
-    model = HealthcareModel(data_dir=base_dir)
+    rule_engine = healthcare_model.rule_engine
     
-    conflicts = model.rule_engine.check_conflicts(
+    conflicts = rule_engine.check_conflicts(
         prescription=["Aspirin", "Warfarin"],
         conditions=[],
         allergies=[]
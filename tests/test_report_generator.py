@@ -6,10 +6,18 @@ from pathlib import Path
 from datetime import datetime
 import tempfile
 import os
+from io import BytesIO
 
 from report_generator import ReportGenerator
 
 
+class _StubGenerator(ReportGenerator):
+    """Subclass used to check that worker processes keep the generator class."""
+
+    def generate_report_bytes(self, format_type, **kwargs):
+        return BytesIO(format_type.encode())
+
+
 @pytest.fixture
 def generator():
     """Create a ReportGenerator instance."""
@@ -254,6 +262,26 @@ class TestBytesGeneration:
         
         assert word_bytes is not None
         assert len(word_bytes.getvalue()) > 0
+    
+    def test_generate_many_preserves_job_order(self, generator, sample_data):
+        """Test batch generation across worker processes."""
+        jobs = [
+            {'format_type': 'pdf', **sample_data},
+            {'format_type': 'word', **sample_data},
+        ]
+        
+        reports = generator.generate_many(jobs, workers=2)
+        
+        assert len(reports) == 2
+        assert reports[0].startswith(b'%PDF')
+        assert reports[1].startswith(b'PK')  # docx is a zip archive
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_generate_many_uses_subclass(self, workers):
+        """Test that a subclass renders the same inline and in worker processes."""
+        jobs = [{'format_type': 'pdf'}, {'format_type': 'word'}]
+        
+        assert _StubGenerator().generate_many(jobs, workers=workers) == [b'pdf', b'word']
 
 
 class TestReportContent:
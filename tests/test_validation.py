@@ -0,0 +1,63 @@
+"""Tests for the uploaded-CSV validators in validation.py.
+
+Verifies that:
+1. Error rows are numbered from the DataFrame index (label + 2, the CSV line)
+2. Several field errors in one row are reported as a single message
+3. Non-integer ids are rejected rather than truncated
+4. Duplicate ids are each listed once
+"""
+
+import pandas as pd
+
+from validation import validate_drugs_csv, validate_patients_csv
+
+
+def _drugs(**overrides):
+    data = {'drug_id': [1, 2, 3], 'drug_name': ['Aspirin', 'Warfarin', 'Ibuprofen'], 'category': ['NSAID'] * 3}
+    data.update(overrides)
+    return data
+
+
+def test_valid_drugs_pass():
+    assert validate_drugs_csv(pd.DataFrame(_drugs())) == (True, [])
+
+
+def test_row_numbers_follow_the_index():
+    df = pd.DataFrame(_drugs(drug_name=['Aspirin', '', 'Ibuprofen']), index=[10, 11, 12])
+    is_valid, errors = validate_drugs_csv(df)
+
+    assert not is_valid
+    assert len(errors) == 1
+    assert errors[0].startswith("Row 13: drug_name:")
+
+
+def test_multiple_errors_in_one_row_are_grouped():
+    df = pd.DataFrame({
+        'patient_id': [1, 2],
+        'name': ['John Doe', 'Jane Smith'],
+        'age': [40, 200],
+        'conditions': ['Hypertension', 'Diabetes'],
+        'medications': ['Lisinopril', 'Metformin'],
+    })
+    df.loc[1, 'patient_id'] = 0
+    is_valid, errors = validate_patients_csv(df)
+
+    assert not is_valid
+    assert len(errors) == 1
+    assert errors[0].startswith("Row 3: ")
+    assert "patient_id:" in errors[0] and "age:" in errors[0]
+
+
+def test_fractional_id_is_rejected():
+    is_valid, errors = validate_drugs_csv(pd.DataFrame(_drugs(drug_id=[1, 2.5, 3])))
+
+    assert not is_valid
+    assert len(errors) == 1
+    assert errors[0].startswith("Row 3: drug_id:")
+
+
+def test_duplicate_ids_listed_once():
+    is_valid, errors = validate_drugs_csv(pd.DataFrame(_drugs(drug_id=[7, 7, 7])))
+
+    assert not is_valid
+    assert errors == ["Duplicate drug IDs found: [7]"]
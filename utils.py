@@ -1,27 +1,37 @@
 from __future__ import annotations
 
+import csv
 import heapq
 import logging
-from dataclasses import dataclass
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple, Any, Set
-from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Any, Set
+from functools import lru_cache, cached_property
+from operator import attrgetter
 
-import pandas as pd
 from data_models import PatientModel, DrugModel, RuleModel, validate_rows
-from validation import sanitize_string, check_xss_attempt, check_sql_injection, validate_input_safe
+
+if TYPE_CHECKING:
+    # pandas is imported lazily by the few functions that need it
+    import pandas as pd
 
 # -----------------
 # Logging utilities
 # -----------------
 
+# Formatters are stateless after construction, so all handlers share one
+_FMT = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
+
+@lru_cache(maxsize=None)
 def get_logger(name: str = "drug_conflict_detection") -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
         logger.setLevel(logging.INFO)
         ch = logging.StreamHandler()
-        fmt = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-        ch.setFormatter(fmt)
+        ch.setFormatter(_FMT)
         logger.addHandler(ch)
     return logger
 
@@ -33,8 +43,10 @@ logger = get_logger()
 
 def _read_raw(path: Path | str) -> List[dict]:
     """Read CSV file - sanitization not needed for trusted CSV files"""
-    df = pd.read_csv(Path(path))
-    return df.to_dict(orient="records")
+    # Rows go straight to the pydantic validators, so a streaming reader is
+    # enough; empty cells become None, which the validators treat as missing
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [{k: v if v != "" else None for k, v in row.items()} for row in csv.DictReader(f)]
 
 def load_patients(path: Path | str) -> List[dict]:
     raw = _read_raw(path)
@@ -70,17 +82,37 @@ SEVERITY_SCORES = {
     "Minor": 1,
 }
 
+# Fallback for non-canonical casing, e.g. "MAJOR" or " minor"
+_SEVERITY_SCORES_LC = {k.lower(): v for k, v in SEVERITY_SCORES.items()}
+_SEVERITY_LABELS = {k.lower(): k for k in SEVERITY_SCORES}
+
 def severity_to_score(severity: str) -> int:
-    return SEVERITY_SCORES.get(str(severity).title(), 0)
+    # Canonical labels (all KB rules) hit the table directly
+    score = SEVERITY_SCORES.get(severity)
+    if score is None:
+        score = _SEVERITY_SCORES_LC.get(_lc(str(severity)), 0)
+    return score
 
 # -----------------
 # Knowledge base
 # -----------------
 
+@lru_cache(maxsize=4096)
+def _lc(s: str) -> str:
+    """Normalized (stripped, lowercase) lookup token.
+
+    Drug and condition names come from a small vocabulary and are looked up
+    over and over, so the case-folded form is cached instead of recomputed.
+    Tokens are interned: KB keys and query sets then hold the same str
+    objects, and dict/set probes match on identity before comparing text.
+    """
+    return sys.intern(s.strip().lower())
+
+
 def _normalize_key(*parts: str) -> Tuple[str, ...]:
-    return tuple(p.strip().lower() for p in parts)
+    return tuple(_lc(p) for p in parts)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rule:
     rtype: str  # 'drug-drug' | 'drug-condition'
     item_a: str
@@ -88,36 +120,128 @@ class Rule:
     severity: str
     recommendation: str
     notes: str | None = None
+    # Derived once at construction, so ranking and KB inserts never
+    # re-parse the label or re-normalize the names
+    score: int = field(init=False, repr=False, compare=False)
+    key: Tuple[str, str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "score", severity_to_score(self.severity))
+        object.__setattr__(self, "key", rule_key(self.rtype, self.item_a, self.item_b))
+
+
+def rule_key(rtype: str, item_a: str, item_b: str) -> Tuple[str, str, str]:
+    """Canonical KB key: drug-drug pairs are order-insensitive (sorted), while
+    drug-condition keeps the condition first."""
+    a, b = _lc(item_a), _lc(item_b)
+    if rtype == "drug-drug" and b < a:
+        a, b = b, a
+    return (rtype, a, b)
+
+
+class KnowledgeBase(Dict[Tuple[str, str, str], Rule]):
+    """Rule lookup table keyed by Rule.key.
+
+    A plain dict subclass so existing ``kb.get(key)`` callers keep working,
+    with room to cache data derived from the rules. Every mutating dict
+    method drops that cached data, so a rule added after build_rules_kb is
+    still found by the next query.
+    """
+
+    # cached_property names rebuilt lazily after any mutation
+    _DERIVED = ("fingerprint", "partitions")
+
+    @cached_property
+    def fingerprint(self) -> frozenset:
+        return _compute_fingerprint(self)
+
+    @cached_property
+    def partitions(self) -> "_RuleIndex":
+        return _index_rules(self)
+
+    def _build_indexes(self) -> None:
+        """Build the rule index now rather than on the first query."""
+        _ = self.partitions  # cached_property stores the result on first access
+
+    def _invalidate(self) -> None:
+        for name in self._DERIVED:
+            self.__dict__.pop(name, None)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._invalidate()
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._invalidate()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._invalidate()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+
+def _compute_fingerprint(kb: Dict[Tuple[str, str, str], Rule]) -> frozenset:
+    """Content identity of a KB: equal rule sets give equal fingerprints."""
+    return frozenset(
+        (key, rule.rtype, rule.item_a, rule.item_b, rule.severity, rule.recommendation)
+        for key, rule in kb.items()
+    )
+
 
-    @property
-    def key(self) -> Tuple[str, str, str]:
-        if self.rtype == "drug-drug":
-            a, b = sorted([self.item_a, self.item_b], key=lambda s: s.lower())
-            return (self.rtype, a.lower(), b.lower())
-        else:
-            # Keep condition first for drug-condition
-            return (self.rtype, self.item_a.lower(), self.item_b.lower())
+def kb_fingerprint(kb: Dict[Tuple[str, str, str], Rule]) -> frozenset:
+    if isinstance(kb, KnowledgeBase):
+        return kb.fingerprint
+    return _compute_fingerprint(kb)
 
 
-def build_rules_kb(rules_rows: Iterable[dict]) -> Dict[Tuple[str, str, str], Rule]:
-    kb: Dict[Tuple[str, str, str], Rule] = {}
+def build_rules_kb(rules_rows: Iterable[dict]) -> KnowledgeBase:
+    kb = KnowledgeBase()
     for r in rules_rows:
+        # Labels and recommendation text repeat across many pairs; intern them
+        # so duplicate rules share one str object.
+        # Rows are validated RuleModel dumps (or literals), so fields are already str
+        severity = r.get("severity", "").strip()
         rule = Rule(
-            rtype=str(r.get("type", "")).strip(),
-            item_a=str(r.get("item_a", "")).strip(),
-            item_b=str(r.get("item_b", "")).strip(),
-            severity=str(r.get("severity", "")).strip().title(),
-            recommendation=str(r.get("recommendation", "")).strip(),
-            notes=str(r.get("notes", "")).strip() or None,
+            rtype=sys.intern(r.get("type", "").strip()),
+            item_a=r.get("item_a", "").strip(),
+            item_b=r.get("item_b", "").strip(),
+            severity=_SEVERITY_LABELS.get(_lc(severity)) or sys.intern(severity.title()),
+            recommendation=sys.intern(r.get("recommendation", "").strip()),
+            notes=(r.get("notes") or "").strip() or None,
         )
         kb[rule.key] = rule
+    kb._build_indexes()
     return kb
 
 # -----------------
-# Best-First Search (BFS) / A* Conflict Detection (optimized)
+# Conflict detection (severity-prioritized)
 # -----------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Conflict:
     rtype: str
     item_a: str
@@ -126,170 +250,175 @@ class Conflict:
     recommendation: str
     score: int
 
+    def as_row(self) -> Dict[str, Any]:
+        """Report/DataFrame row, keyed by the public column names."""
+        return dict(zip(_CONFLICT_COLUMNS, _conflict_values(self)))
 
-@dataclass(frozen=True)
-class SearchState:
-    """Represents a state in the conflict search space.
-    
-    State = set of active conflicts detected so far in the prescription.
-    """
-    prescription: frozenset[str]  # drugs in prescription
-    conditions: frozenset[str]    # patient conditions/allergies
-    detected_conflicts: frozenset[Tuple[str, str, str]]  # rule keys already found
-    
-    def __lt__(self, other):
-        # Tie-breaking for heapq (not priority, just stable ordering)
-        return len(self.detected_conflicts) < len(other.detected_conflicts)
+
+_CONFLICT_COLUMNS = ("type", "item_a", "item_b", "severity", "score", "recommendation")
+_conflict_values = attrgetter("rtype", "item_a", "item_b", "severity", "score", "recommendation")
 
 
 def make_condition_tokens(conditions: Iterable[str], allergies: Iterable[str] | None = None) -> List[str]:
-    tokens = [str(c).strip() for c in conditions if str(c).strip()]
     if allergies:
         # Guard against scalar (float/str)
         if isinstance(allergies, (str, float, int)):
             allergies = [allergies]
-        for a in allergies:
-            a = str(a).strip()
-            if a and a.lower() != "none":
-                tokens.append(f"{a}Allergy")
-    return tokens
+        allergies = tuple(allergies)
+    else:
+        allergies = ()
+    # Same patient -> same tokens on every check; copy so callers may mutate
+    return list(_condition_tokens(tuple(conditions), allergies))
 
 
-def _compute_heuristic(state: SearchState, kb: Dict[Tuple[str, str, str], Rule]) -> int:
-    """Heuristic: sum of severity scores of detected conflicts (higher = worse state)."""
-    total = 0
-    for key in state.detected_conflicts:
-        rule = kb.get(key)
-        if rule:
-            total += severity_to_score(rule.severity)
-    return total
+@lru_cache(maxsize=1024)
+def _condition_tokens(conditions: Tuple[str, ...], allergies: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Strip each value once; allergies become "<Name>Allergy" condition tokens
+    tokens = [c for c in map(str.strip, map(str, conditions)) if c]
+    tokens.extend(a + "Allergy" for a in map(str.strip, map(str, allergies)) if a and _lc(a) != "none")
+    return tuple(tokens)
 
 
-def _precompute_candidate_keys(drugs_set: frozenset[str], cond_set: frozenset[str], kb: Dict[Tuple[str, str, str], Rule]) -> List[Tuple[str, str, str]]:
-    """Precompute all possible conflict keys for this prescription/condition set once.
+_RuleIndex = Tuple[Dict[str, List[Tuple[str, str, str]]], Dict[str, List[Tuple[str, str, str]]]]
+
 
-    This replaces repeated nested pair generation inside each expansion step.
+def _index_rules(kb: Dict[Tuple[str, str, str], Rule]) -> _RuleIndex:
+    """Partition KB keys by rule type, each key filed under one endpoint only.
+
+    drug-drug keys are listed under their first (sorted) drug, drug-condition
+    keys under their condition, so a lookup visits every rule at most once.
     """
-    drugs = list(drugs_set)
-    conditions = list(cond_set)
-    candidate: List[Tuple[str, str, str]] = []
-    # drug-drug
-    for i in range(len(drugs)):
-        di = drugs[i]
-        for j in range(i + 1, len(drugs)):
-            dj = drugs[j]
-            a, b = sorted([di, dj], key=lambda s: s.lower())
-            key = ("drug-drug", a.lower(), b.lower())
-            if key in kb:
-                candidate.append(key)
-    # drug-condition
-    for c in conditions:
-        for d in drugs:
-            key = ("drug-condition", c.lower(), d.lower())
-            if key in kb:
-                candidate.append(key)
-    return candidate
-
-
-def _expand_neighbors(state: SearchState, all_candidate_keys: List[Tuple[str, str, str]], kb: Dict[Tuple[str, str, str], Rule]) -> List[Tuple[SearchState, Tuple[str, str, str], int]]:
-    """Generate neighbor states by adding one yet-undiscovered conflict from precomputed candidates."""
-    neighbors: List[Tuple[SearchState, Tuple[str, str, str], int]] = []
-    remaining = [k for k in all_candidate_keys if k not in state.detected_conflicts]
-    for key in remaining:
-        rule = kb[key]
-        score = severity_to_score(rule.severity)
-        new_state = SearchState(
-            prescription=state.prescription,
-            conditions=state.conditions,
-            detected_conflicts=state.detected_conflicts | {key}
-        )
-        neighbors.append((new_state, key, score))
-    return neighbors
+    drug_drug: Dict[str, List[Tuple[str, str, str]]] = {}
+    drug_condition: Dict[str, List[Tuple[str, str, str]]] = {}
+    for key in kb:
+        rtype, a, _ = key
+        if rtype == "drug-drug":
+            drug_drug.setdefault(a, []).append(key)
+        elif rtype == "drug-condition":
+            drug_condition.setdefault(a, []).append(key)
+    return drug_drug, drug_condition
+
 
+def _rule_index(kb: Dict[Tuple[str, str, str], Rule]) -> _RuleIndex:
+    if isinstance(kb, KnowledgeBase):
+        return kb.partitions
+    return _index_rules(kb)
 
-_MEMO_CACHE: Dict[Tuple[frozenset[str], frozenset[str], int], List[Conflict]] = {}
+
+def _precompute_candidate_keys(drugs_set: frozenset[str], cond_set: frozenset[str], kb: Dict[Tuple[str, str, str], Rule]) -> List[Tuple[str, str, str]]:
+    """Collect every KB key whose endpoints are all present in this query.
+
+    Expects lowercase tokens. Only rules filed under a queried token are
+    visited (via the partitioned index), so the cost scales with the number
+    of matching rules rather than with the number of drug pairs, and no
+    key can be produced twice.
+    """
+    drug_drug, drug_condition = _rule_index(kb)
+    candidates = [
+        key
+        for drug in drugs_set
+        for key in drug_drug.get(drug, ())
+        if key[2] in drugs_set
+    ]
+    # Keep condition first for drug-condition
+    candidates.extend(
+        key
+        for cond in cond_set
+        for key in drug_condition.get(cond, ())
+        if key[2] in drugs_set
+    )
+    return candidates
+
+
+# Bounded LRU: a long-running app sees an open-ended stream of distinct queries
+_MEMO_MAXSIZE = 1024
+_MEMO_CACHE: OrderedDict[Tuple[frozenset[str], frozenset[str], frozenset], Tuple[Conflict, ...]] = OrderedDict()
 _MEMO_STATS = {"hits": 0, "misses": 0}
+# Streamlit sessions run in separate threads and share this cache
+_MEMO_LOCK = threading.Lock()
 
 
-def get_conflicts_cached(prescription: List[str], conditions: List[str], kb: Dict[Tuple[str, str, str], Rule]) -> List[Conflict]:
+def get_conflicts_cached(prescription: List[str], conditions: List[str], kb: Dict[Tuple[str, str, str], Rule]) -> Tuple[Conflict, ...]:
     """Public wrapper providing memoized conflict detection.
 
-    Cache key includes id(kb) so rebuilding the knowledge base invalidates entries.
-    Returns a copy of cached list to avoid accidental mutation.
+    Cache key includes the KB content fingerprint, so a rebuilt but identical
+    knowledge base reuses entries while changed rules invalidate them.
+    Matching is case-insensitive, so names are lowercased in the key.
+    Conflicts are frozen, so the cached tuple itself is returned (call
+    list() on it if you need to modify the sequence). At most _MEMO_MAXSIZE
+    results are kept; the least recently used is evicted first.
     """
-    drugs_set = frozenset(d.strip() for d in prescription if d and str(d).strip())
-    cond_set = frozenset(c.strip() for c in conditions if c and str(c).strip())
-    key = (drugs_set, cond_set, id(kb))
-    cached = _MEMO_CACHE.get(key)
-    if cached is not None:
-        _MEMO_STATS["hits"] += 1
-        return [Conflict(**c.__dict__) for c in cached]
-    _MEMO_STATS["misses"] += 1
-    result = bfs_conflicts(prescription, conditions, kb)
-    _MEMO_CACHE[key] = [Conflict(**c.__dict__) for c in result]
+    drugs_set = frozenset(t for t in map(_lc, filter(None, prescription)) if t)
+    cond_set = frozenset(t for t in map(_lc, filter(None, conditions)) if t)
+    key = (drugs_set, cond_set, kb_fingerprint(kb))
+    with _MEMO_LOCK:
+        cached = _MEMO_CACHE.get(key)
+        if cached is not None:
+            _MEMO_STATS["hits"] += 1
+            _MEMO_CACHE.move_to_end(key)
+            return cached
+        _MEMO_STATS["misses"] += 1
+    # Search outside the lock; a concurrent miss on the same key just recomputes
+    result = tuple(bfs_conflicts(prescription, conditions, kb))
+    with _MEMO_LOCK:
+        _MEMO_CACHE[key] = result
+        if len(_MEMO_CACHE) > _MEMO_MAXSIZE:
+            _MEMO_CACHE.popitem(last=False)
     return result
 
 
-def bfs_conflicts(prescription: List[str], conditions: List[str], kb: Dict[Tuple[str, str, str], Rule]) -> List[Conflict]:
+def _conflict_rank(c: Conflict) -> Tuple[int, str, str]:
+    """Sort key: severity descending, then item names for a stable order."""
+    return (-c.score, c.item_a, c.item_b)
+
+
+def _drain_until(conflicts: List[Conflict], threshold: int) -> List[Conflict]:
+    """Conflicts worst-first, stopping right after the first one scoring at
+    least ``threshold``.
+
+    The worst conflict either meets the threshold (and is the only one
+    emitted) or nothing does, so this is one min() scan or one sort.
     """
-    True Best-First Search (A*-style) over conflict discovery space.
-    
-    Goal: explore the prescription systematically, prioritizing discovery of high-severity conflicts first.
-    State: set of conflicts detected so far
-    Heuristic: cumulative severity score (higher = more critical state to explore)
-    Neighbors: adding one more detectable conflict to current state
-    
-    This ensures Major conflicts are surfaced and reported before Minor ones.
+    if not conflicts:
+        return []
+    worst = min(conflicts, key=_conflict_rank)
+    if worst.score >= threshold:
+        return [worst]
+    return sorted(conflicts, key=_conflict_rank)
+
+
+def bfs_conflicts(prescription: List[str], conditions: List[str], kb: Dict[Tuple[str, str, str], Rule], top_k: int | None = None, stop_at_severity: str | None = None) -> List[Conflict]:
+    """
+    Severity-prioritized conflict detection.
+
+    Every conflict reachable from a prescription/condition set is fully
+    determined by which rules have both endpoints in that set, so the
+    matching rules are looked up directly through a partitioned rule index and
+    sorted once: Major conflicts are reported before Minor ones.
+
+    With ``top_k``, only the k most severe conflicts are returned (in the
+    same order), selected with a heap instead of a full sort.
+
+    With ``stop_at_severity`` (e.g. "Major"), conflicts are emitted
+    best-first and the search stops as soon as one at least that severe
+    is emitted, for callers that only need to know whether it exists.
+    An unknown label raises ValueError rather than matching everything.
     """
-    drugs_set = frozenset(d.strip() for d in prescription if d and str(d).strip())
-    cond_set = frozenset(c.strip() for c in conditions if c and str(c).strip())
-    
+    threshold = None
+    if stop_at_severity is not None:
+        threshold = severity_to_score(stop_at_severity)
+        if threshold == 0:
+            raise ValueError(f"Unknown stop_at_severity {stop_at_severity!r}; expected one of {list(SEVERITY_SCORES)}")
+
+    drugs_set = frozenset(t for t in map(_lc, filter(None, prescription)) if t)
+    cond_set = frozenset(t for t in map(_lc, filter(None, conditions)) if t)
+
     if not drugs_set:
         return []
-    
-    # Precompute candidate keys for optimization
-    candidate_keys = _precompute_candidate_keys(drugs_set, cond_set, kb)
-
-    # Initial state: no conflicts detected yet
-    initial = SearchState(prescription=drugs_set, conditions=cond_set, detected_conflicts=frozenset())
-    
-    # Priority queue: (priority, counter, state, path_score)
-    # Priority = -(heuristic + path_cost) for max-heap behavior (explore worst states first)
-    heap: List[Tuple[int, int, SearchState]] = []
-    visited: set[frozenset[Tuple[str, str, str]]] = set()
-    counter = 0
-    
-    heapq.heappush(heap, (0, counter, initial))
-    counter += 1
-    
-    all_conflicts: Dict[Tuple[str, str, str], Rule] = {}
-    
-    while heap:
-        _, _, state = heapq.heappop(heap)
-        
-        # Skip if we've seen this conflict set
-        if state.detected_conflicts in visited:
-            continue
-        visited.add(state.detected_conflicts)
-        
-        # Record conflicts from this state
-        for key in state.detected_conflicts:
-            if key not in all_conflicts:
-                all_conflicts[key] = kb[key]
-        
-        # Expand neighbors using precomputed candidate keys
-        neighbors = _expand_neighbors(state, candidate_keys, kb)
-        
-        for new_state, new_key, conflict_score in neighbors:
-            if new_state.detected_conflicts not in visited:
-                # Priority: negative heuristic (explore high-severity paths first)
-                h = _compute_heuristic(new_state, kb)
-                heapq.heappush(heap, (-h, counter, new_state))
-                counter += 1
-    
-    # Convert to conflict list sorted by severity
+
     results: List[Conflict] = []
-    for key, rule in all_conflicts.items():
+    for key in _precompute_candidate_keys(drugs_set, cond_set, kb):
+        rule = kb[key]
         results.append(
             Conflict(
                 rtype=rule.rtype,
@@ -297,31 +426,37 @@ def bfs_conflicts(prescription: List[str], conditions: List[str], kb: Dict[Tuple
                 item_b=rule.item_b,
                 severity=rule.severity,
                 recommendation=rule.recommendation,
-                score=severity_to_score(rule.severity),
+                score=rule.score,
             )
         )
-    
+
+    if threshold is not None:
+        results = _drain_until(results, threshold)
+        return results if top_k is None else results[:top_k]
+
+    if top_k is not None:
+        return heapq.nsmallest(top_k, results, key=_conflict_rank)
+
     # Sort by severity descending (Major first)
-    results.sort(key=lambda c: (-c.score, c.item_a, c.item_b))
-    
+    results.sort(key=_conflict_rank)
+
     return results
 
 
-def conflicts_to_frame(conflicts: List[dict | Conflict]) -> pd.DataFrame:
-    rows: List[Dict[str, Any]] = []
-    for c in conflicts:
-        if isinstance(c, Conflict):
-            rows.append({
-                "type": c.rtype,
-                "item_a": c.item_a,
-                "item_b": c.item_b,
-                "severity": c.severity,
-                "score": c.score,
-                "recommendation": c.recommendation,
-            })
-        else:
-            rows.append(dict(c))
-    return pd.DataFrame(rows)
+def conflicts_to_frame(conflicts: Iterable[dict | Conflict]) -> pd.DataFrame:
+    import pandas as pd
+    conflicts = list(conflicts)  # inspected twice below; don't exhaust an iterator
+    if all(isinstance(c, Conflict) for c in conflicts):
+        # Fixed schema: build from tuples with explicit columns, no per-row dicts
+        df = pd.DataFrame.from_records(list(map(_conflict_values, conflicts)), columns=_CONFLICT_COLUMNS)
+    else:
+        df = pd.DataFrame([c.as_row() if isinstance(c, Conflict) else dict(c) for c in conflicts])
+    if "severity" in df:
+        # Severity order Major -> Minor; labels outside the known scale are
+        # kept as trailing categories rather than turned into NaN
+        extra = sorted(set(df["severity"].dropna()) - SEVERITY_SCORES.keys())
+        df["severity"] = pd.Categorical(df["severity"], categories=[*SEVERITY_SCORES, *extra], ordered=True)
+    return df
 
 # -----------------
 # Optional plotting
@@ -338,16 +473,15 @@ def plot_severity_distribution(conflicts_df: pd.DataFrame):
         return
     try:
         import matplotlib.pyplot as plt  # type: ignore
-        import seaborn as sns  # type: ignore
     except ImportError as e:
-        print(f"Plot dependencies missing: {e}. Install matplotlib and seaborn.")
+        print(f"Plot dependencies missing: {e}. Install matplotlib.")
         return
-    order = ["Major", "Moderate", "Minor"]
-    counts = conflicts_df["severity"].value_counts()
-    data = pd.DataFrame({"severity": counts.index, "count": counts.values})
-    data = data.set_index("severity").reindex(order).fillna(0).reset_index()
+    order = list(SEVERITY_SCORES)
+    # Categorical severities (conflicts_to_frame) count over int codes; the
+    # reindex only pins the order and drops labels outside the scale
+    counts = conflicts_df["severity"].value_counts(sort=False).reindex(order, fill_value=0)
     plt.figure(figsize=(6, 4))
-    sns.barplot(x="severity", y="count", data=data, order=order, palette="Reds")
+    counts.plot.bar(color=["#a50f15", "#de2d26", "#fb6a4a"], rot=0)
     plt.title("Conflict Severity Distribution")
     plt.xlabel("Severity")
     plt.ylabel("Count")
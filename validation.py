@@ -8,11 +8,53 @@ Provides comprehensive validation and sanitization functions for:
 - Security checks for file uploads and data processing
 """
 
+from __future__ import annotations
+
 import re
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from datetime import datetime
-import pandas as pd
-from pydantic import BaseModel, Field, field_validator, ValidationError
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, ValidationError
+
+if TYPE_CHECKING:
+    # Only the validate_*_csv functions take DataFrames, and callers pass them in;
+    # sanitizers and security checks should not pay for importing pandas
+    import pandas as pd
+
+
+# ===========================
+# Compiled Patterns
+# ===========================
+# Compiled once at import; the validators and checks below run per cell/input
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_INJECTION_CHARS_RE = re.compile(r'[<>\"\'%;()&+]')
+_NAME_DISALLOWED_RE = re.compile(r'[^a-zA-Z\s\-\']')
+_DANGEROUS_CHARS_RE = re.compile(r'[<>\"\'%&]')
+_SQL_WRITE_STMT_RE = re.compile(r'\b(DROP|DELETE|INSERT|UPDATE)\s+(TABLE|FROM|INTO)', re.IGNORECASE)
+_SQL_UNION_RE = re.compile(r'UNION\s+SELECT', re.IGNORECASE)
+_SQL_TRAILING_COMMENT_RE = re.compile(r'--\s*$')
+_FILENAME_DISALLOWED_RE = re.compile(r'[^\w\-\.]')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PASSWORD_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
+# Each check fuses its pattern list into one alternation: a single search
+# matches iff any of the individual patterns would
+_XSS_RE = re.compile('|'.join([
+    r'<script[^>]*>.*?</script>',
+    r'javascript:',
+    r'on\w+\s*=',
+    r'<iframe',
+    r'<object',
+    r'<embed',
+]), re.IGNORECASE)
+_SQL_INJECTION_RE = re.compile('|'.join([
+    r"(?:\bOR\b|\bAND\b)\s+['\"]?\d+['\"]?\s*=\s*['\"]?\d+['\"]?",
+    r";\s*(?:DROP|DELETE|INSERT|UPDATE|CREATE|ALTER)",
+    r"UNION\s+SELECT",
+    r"--",
+    r"/\*.*\*/",
+    r"xp_cmdshell",
+]), re.IGNORECASE)
 
 
 # ===========================
@@ -32,7 +74,7 @@ class DrugValidator(BaseModel):
         if not v or not isinstance(v, str):
             raise ValueError("Must be a non-empty string")
         # Remove special characters that could be used for injection
-        sanitized = re.sub(r'[<>\"\'%;()&+]', '', v)
+        sanitized = _INJECTION_CHARS_RE.sub('', v)
         return sanitized.strip()
 
 
@@ -51,7 +93,7 @@ class PatientValidator(BaseModel):
         if not v or not isinstance(v, str):
             raise ValueError("Name must be a non-empty string")
         # Allow only letters, spaces, hyphens, and apostrophes
-        sanitized = re.sub(r'[^a-zA-Z\s\-\']', '', v)
+        sanitized = _NAME_DISALLOWED_RE.sub('', v)
         return sanitized.strip()
     
     @field_validator('conditions', 'medications')
@@ -61,8 +103,8 @@ class PatientValidator(BaseModel):
         if not isinstance(v, str):
             return ""
         # Remove HTML/script tags and special characters
-        sanitized = re.sub(r'<[^>]+>', '', v)
-        sanitized = re.sub(r'[<>\"\'%;()&+]', '', sanitized)
+        sanitized = _HTML_TAG_RE.sub('', v)
+        sanitized = _INJECTION_CHARS_RE.sub('', sanitized)
         return sanitized.strip()
 
 
@@ -80,7 +122,7 @@ class RuleValidator(BaseModel):
         """Sanitize drug names in rules"""
         if not v or not isinstance(v, str):
             raise ValueError("Drug name must be a non-empty string")
-        sanitized = re.sub(r'[<>\"\'%;()&+]', '', v)
+        sanitized = _INJECTION_CHARS_RE.sub('', v)
         return sanitized.strip()
     
     @field_validator('description')
@@ -90,8 +132,8 @@ class RuleValidator(BaseModel):
         if not v or not isinstance(v, str):
             raise ValueError("Description must be a non-empty string")
         # Remove HTML/script tags
-        sanitized = re.sub(r'<[^>]+>', '', v)
-        sanitized = re.sub(r'[<>\"\'%;()&+]', '', sanitized)
+        sanitized = _HTML_TAG_RE.sub('', v)
+        sanitized = _INJECTION_CHARS_RE.sub('', sanitized)
         return sanitized.strip()
 
 
@@ -99,6 +141,45 @@ class RuleValidator(BaseModel):
 # CSV Validation Functions
 # ===========================
 
+# Whole-table validators: one pydantic-core pass per CSV instead of a model per row
+_DRUG_ROWS = TypeAdapter(List[DrugValidator])
+_PATIENT_ROWS = TypeAdapter(List[PatientValidator])
+_RULE_ROWS = TypeAdapter(List[RuleValidator])
+
+
+def _row_errors(adapter: TypeAdapter, df: pd.DataFrame, int_cols: List[str], str_cols: List[str]) -> List[str]:
+    """
+    Validate every row of df at once
+    
+    Args:
+        adapter: TypeAdapter over a list of row models
+        df: DataFrame to validate
+        int_cols: Columns passed through for integer validation
+        str_cols: Columns converted to str first
+        
+    Returns:
+        One "Row N: ..." message per invalid row (N is the CSV line number)
+    """
+    records = df[int_cols].copy()
+    for col in str_cols:
+        records[col] = df[col].map(str)
+    try:
+        adapter.validate_python(records.to_dict(orient='records'))
+    except ValidationError as e:
+        by_row: Dict[int, List[str]] = {}
+        for err in e.errors():
+            pos, *field = err['loc']
+            by_row.setdefault(pos, []).append(f"{'.'.join(map(str, field))}: {err['msg']}")
+        return [f"Row {df.index[pos] + 2}: {'; '.join(msgs)}" for pos, msgs in by_row.items()]
+    return []
+
+
+def _duplicate_ids(ids: pd.Series) -> list:
+    """IDs occurring more than once, in order of first appearance (one hash pass)"""
+    counts = ids.value_counts(sort=False, dropna=False)
+    return counts[counts > 1].index.tolist()
+
+
 def validate_drugs_csv(df: pd.DataFrame) -> tuple[bool, List[str]]:
     """
     Validate drugs CSV data
@@ -118,20 +199,12 @@ def validate_drugs_csv(df: pd.DataFrame) -> tuple[bool, List[str]]:
         errors.append(f"Missing required columns: {', '.join(missing_cols)}")
         return False, errors
     
-    # Validate each row
-    for idx, row in df.iterrows():
-        try:
-            DrugValidator(
-                drug_id=int(row['drug_id']),
-                drug_name=str(row['drug_name']),
-                category=str(row['category'])
-            )
-        except (ValidationError, ValueError) as e:
-            errors.append(f"Row {idx + 2}: {str(e)}")
+    # Validate all rows
+    errors.extend(_row_errors(_DRUG_ROWS, df, ['drug_id'], ['drug_name', 'category']))
     
     # Check for duplicate drug IDs
-    if df['drug_id'].duplicated().any():
-        duplicate_ids = df[df['drug_id'].duplicated()]['drug_id'].tolist()
+    duplicate_ids = _duplicate_ids(df['drug_id'])
+    if duplicate_ids:
         errors.append(f"Duplicate drug IDs found: {duplicate_ids}")
     
     return len(errors) == 0, errors
@@ -156,22 +229,14 @@ def validate_patients_csv(df: pd.DataFrame) -> tuple[bool, List[str]]:
         errors.append(f"Missing required columns: {', '.join(missing_cols)}")
         return False, errors
     
-    # Validate each row
-    for idx, row in df.iterrows():
-        try:
-            PatientValidator(
-                patient_id=int(row['patient_id']),
-                name=str(row['name']),
-                age=int(row['age']),
-                conditions=str(row.get('conditions', '')),
-                medications=str(row.get('medications', ''))
-            )
-        except (ValidationError, ValueError) as e:
-            errors.append(f"Row {idx + 2}: {str(e)}")
+    # Validate all rows
+    errors.extend(_row_errors(
+        _PATIENT_ROWS, df, ['patient_id', 'age'], ['name', 'conditions', 'medications']
+    ))
     
     # Check for duplicate patient IDs
-    if df['patient_id'].duplicated().any():
-        duplicate_ids = df[df['patient_id'].duplicated()]['patient_id'].tolist()
+    duplicate_ids = _duplicate_ids(df['patient_id'])
+    if duplicate_ids:
         errors.append(f"Duplicate patient IDs found: {duplicate_ids}")
     
     return len(errors) == 0, errors
@@ -196,22 +261,14 @@ def validate_rules_csv(df: pd.DataFrame) -> tuple[bool, List[str]]:
         errors.append(f"Missing required columns: {', '.join(missing_cols)}")
         return False, errors
     
-    # Validate each row
-    for idx, row in df.iterrows():
-        try:
-            RuleValidator(
-                rule_id=int(row['rule_id']),
-                drug1=str(row['drug1']),
-                drug2=str(row['drug2']),
-                severity=str(row['severity']),
-                description=str(row['description'])
-            )
-        except (ValidationError, ValueError) as e:
-            errors.append(f"Row {idx + 2}: {str(e)}")
+    # Validate all rows
+    errors.extend(_row_errors(
+        _RULE_ROWS, df, ['rule_id'], ['drug1', 'drug2', 'severity', 'description']
+    ))
     
     # Check for duplicate rule IDs
-    if df['rule_id'].duplicated().any():
-        duplicate_ids = df[df['rule_id'].duplicated()]['rule_id'].tolist()
+    duplicate_ids = _duplicate_ids(df['rule_id'])
+    if duplicate_ids:
         errors.append(f"Duplicate rule IDs found: {duplicate_ids}")
     
     return len(errors) == 0, errors
@@ -239,17 +296,17 @@ def sanitize_string(input_str: str, max_length: int = 1000) -> str:
     sanitized = input_str[:max_length]
     
     # Remove HTML/script tags
-    sanitized = re.sub(r'<[^>]+>', '', sanitized)
+    sanitized = _HTML_TAG_RE.sub('', sanitized)
     
     # Remove only the most dangerous characters (XSS/injection)
     # Keep parentheses, semicolons (for CSV lists), and common punctuation
-    sanitized = re.sub(r'[<>\"\'%&]', '', sanitized)
+    sanitized = _DANGEROUS_CHARS_RE.sub('', sanitized)
     
     # Remove SQL keywords only if they appear in suspicious patterns
     # Don't remove from normal text (e.g., "select medication")
-    sanitized = re.sub(r'\b(DROP|DELETE|INSERT|UPDATE)\s+(TABLE|FROM|INTO)', '', sanitized, flags=re.IGNORECASE)
-    sanitized = re.sub(r'UNION\s+SELECT', '', sanitized, flags=re.IGNORECASE)
-    sanitized = re.sub(r'--\s*$', '', sanitized)  # SQL comments at end of line
+    sanitized = _SQL_WRITE_STMT_RE.sub('', sanitized)
+    sanitized = _SQL_UNION_RE.sub('', sanitized)
+    sanitized = _SQL_TRAILING_COMMENT_RE.sub('', sanitized)  # SQL comments at end of line
     
     return sanitized.strip()
 
@@ -271,7 +328,7 @@ def sanitize_filename(filename: str) -> str:
     filename = filename.replace('..', '').replace('/', '').replace('\\', '')
     
     # Keep only alphanumeric, dots, underscores, and hyphens
-    sanitized = re.sub(r'[^\w\-\.]', '_', filename)
+    sanitized = _FILENAME_DISALLOWED_RE.sub('_', filename)
     
     # Limit length
     sanitized = sanitized[:255]
@@ -361,8 +418,7 @@ def validate_email(email: str) -> bool:
         return False
     
     # Basic email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_password_strength(password: str) -> tuple[bool, List[str]]:
@@ -389,7 +445,7 @@ def validate_password_strength(password: str) -> tuple[bool, List[str]]:
     if not re.search(r'\d', password):
         errors.append("Password must contain at least one digit")
     
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not _PASSWORD_SPECIAL_RE.search(password):
         errors.append("Password must contain at least one special character")
     
     return len(errors) == 0, errors
@@ -412,20 +468,7 @@ def check_xss_attempt(input_str: str) -> bool:
     if not input_str or not isinstance(input_str, str):
         return False
     
-    xss_patterns = [
-        r'<script[^>]*>.*?</script>',
-        r'javascript:',
-        r'on\w+\s*=',
-        r'<iframe',
-        r'<object',
-        r'<embed',
-    ]
-    
-    for pattern in xss_patterns:
-        if re.search(pattern, input_str, re.IGNORECASE):
-            return True
-    
-    return False
+    return _XSS_RE.search(input_str) is not None
 
 
 def check_sql_injection(input_str: str) -> bool:
@@ -441,20 +484,7 @@ def check_sql_injection(input_str: str) -> bool:
     if not input_str or not isinstance(input_str, str):
         return False
     
-    sql_patterns = [
-        r"(\bOR\b|\bAND\b)\s+['\"]?\d+['\"]?\s*=\s*['\"]?\d+['\"]?",
-        r";\s*(DROP|DELETE|INSERT|UPDATE|CREATE|ALTER)",
-        r"UNION\s+SELECT",
-        r"--",
-        r"/\*.*\*/",
-        r"xp_cmdshell",
-    ]
-    
-    for pattern in sql_patterns:
-        if re.search(pattern, input_str, re.IGNORECASE):
-            return True
-    
-    return False
+    return _SQL_INJECTION_RE.search(input_str) is not None
 
 
 def check_path_traversal(path: str) -> bool: